@@ -1,12 +1,15 @@
 import hashlib
 import requests
+import sys
 import time
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import json
+import os
 from collections import defaultdict
 from dateutil.parser import parse
 from datetime import datetime
+from urllib.parse import urlencode
 
 # =========================
 # HELPERS
@@ -26,6 +29,20 @@ def to_crm_date(dt):
         return ""
     return dt.strftime("%Y-%m-%d")
 
+# CRM session lifetime; get_session logs in again once it passes
+SESSION_TTL = 3600
+
+# Per-operation call stats for this run: calls, seconds, bytes out/in.
+CALL_STATS = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "bytes_out": 0, "bytes_in": 0})
+
+def record_call(op, seconds, bytes_out=0, bytes_in=0):
+    """Accumulate timing and payload size of one remote call."""
+    st = CALL_STATS[op]
+    st["calls"] += 1
+    st["seconds"] += seconds
+    st["bytes_out"] += bytes_out
+    st["bytes_in"] += bytes_in
+
 
 # =========================
 # CRM CLIENT
@@ -38,9 +55,18 @@ class CRMClient:
         self.session_name = None
         self.session_expiry = 0
 
+    def _timed(self, op, method, *args, **kwargs):
+        """Run a requests call and record its latency under `op`."""
+        start = time.time()
+        response = method(*args, **kwargs)
+        body = response.request.body or ""
+        record_call(op, time.time() - start,
+                    len(response.request.url) + len(body), len(response.content))
+        return response
+
     def _get_challenge(self):
         url = f"{self.base_url}?operation=getchallenge&username={self.username}"
-        response = requests.get(url).json()
+        response = self._timed("login", requests.get, url).json()
 
         if not response.get("success"):
             raise Exception("Failed to get challenge token")
@@ -52,7 +78,7 @@ class CRMClient:
         token = ch["token"]
 
         # FIX 1 → ignore CRM timestamp completely
-        self.session_expiry = time.time() + 3600   # session valid 1 hour
+        self.session_expiry = time.time() + SESSION_TTL   # session valid 1 hour
 
         key_hash = hashlib.md5((token + self.access_key).encode()).hexdigest()
         data = {
@@ -61,7 +87,7 @@ class CRMClient:
             "accessKey": key_hash
         }
 
-        response = requests.post(self.base_url, data=data).json()
+        response = self._timed("login", requests.post, self.base_url, data=data).json()
 
         if not response.get("success"):
             raise Exception("CRM login failed: " + str(response))
@@ -83,13 +109,13 @@ class CRMClient:
             "elementType": "Leads",
             "element": json.dumps(lead_data)
         }
-        response = requests.post(self.base_url, data=data).json()
+        response = self._timed("create", requests.post, self.base_url, data=data).json()
 
         # FIX 3 → retry once on invalid session
         if not response.get("success") and "invalid" in str(response).lower():
             session = self._login()
             data["sessionName"] = session
-            response = requests.post(self.base_url, data=data).json()
+            response = self._timed("create", requests.post, self.base_url, data=data).json()
 
         if not response.get("success"):
             print("🔴 CRM ERROR (create_lead):", response, flush=True)
@@ -105,14 +131,14 @@ class CRMClient:
             "id": lead_id
         }
 
-        response = requests.get(self.base_url, params=params).json()
+        response = self._timed("retrieve", requests.get, self.base_url, params=params).json()
 
         # FIX 4 → retry retrieve if CRM invalidates session
         if not response.get("success"):
             if "invalid" in str(response).lower() or "session" in str(response).lower():
                 session = self._login()
                 params["sessionName"] = session
-                response = requests.get(self.base_url, params=params).json()
+                response = self._timed("retrieve", requests.get, self.base_url, params=params).json()
 
         if not response.get("success"):
             print("🔴 CRM ERROR (get_lead):", response, flush=True)
@@ -120,6 +146,16 @@ class CRMClient:
 
         return response["result"]
 
+    def update_lead(self, lead_data):
+        # Fire-and-forget: flow 2 never acted on the update response
+        session = self.get_session()
+        data = {
+            "operation": "update",
+            "sessionName": session,
+            "element": json.dumps(lead_data)
+        }
+        return self._timed("update", requests.post, self.base_url, data=data)
+
     def get_all_comments(self, lead_id):
         session = self.get_session()
         query = (
@@ -132,14 +168,14 @@ class CRMClient:
             "query": query
         }
 
-        res = requests.get(self.base_url, params=params).json()
+        res = self._timed("query", requests.get, self.base_url, params=params).json()
 
         # FIX 5 → retry on invalid session
         if not res.get("success"):
             if "invalid" in str(res).lower():
                 session = self._login()
                 params["sessionName"] = session
-                res = requests.get(self.base_url, params=params).json()
+                res = self._timed("query", requests.get, self.base_url, params=params).json()
 
         if not res.get("success"):
             print("🔴 CRM ERROR (get_all_comments):", res, flush=True)
@@ -175,6 +211,13 @@ CRM_UPDATE_COL = "CRM Update"
 
 SERVICE_ACCOUNT_FILE = "/etc/secrets/service_account.json"
 
+# Dry run: plan flows 1 and 2 without writing to the CRM or the sheets
+DRY_RUN = "--dry-run" in sys.argv
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLAN_FILE = os.path.join(BASE_DIR, "dry_run_plan.json")
+LATENCY_FILE = os.path.join(BASE_DIR, "crm_latency.json")
+PLANNED_HEADERS = []
+
 scope = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/drive"
@@ -196,6 +239,12 @@ def col_to_a1(col):
         letters = chr(65 + rem) + letters
     return letters
 
+def a1_to_col(letters):
+    col = 0
+    for ch in letters:
+        col = col * 26 + (ord(ch) - 64)
+    return col
+
 def header_to_index(header):
     return {h: i + 1 for i, h in enumerate(header)}
 
@@ -206,9 +255,35 @@ def ensure_col(ws, hmap, header, col_name):
     if col_name in hmap:
         return hmap[col_name]
     col = len(header) + 1
+    if DRY_RUN:
+        PLANNED_HEADERS.append({"tab": ws.title, "range": f"{col_to_a1(col)}1", "value": col_name})
+        return col
+    start = time.time()
     ws.update(f"{col_to_a1(col)}1", col_name)
+    record_call("sheets_write", time.time() - start, len(json.dumps([[col_name]])), 0)
     return col
 
+def fetch_values(ws):
+    start = time.time()
+    vals = ws.get_all_values()
+    record_call("sheets_read", time.time() - start, 0, len(json.dumps(vals)))
+    return vals
+
+def apply_sheet_updates(updates):
+    for ws, batch in updates.items():
+        if batch:
+            start = time.time()
+            ws.batch_update(batch)
+            record_call("sheets_write", time.time() - start, len(json.dumps(batch)), 0)
+
+def is_duplicate_marked(row_vals, hmap):
+    crm_update_idx = hmap.get(CRM_UPDATE_COL)
+    if crm_update_idx:
+        crm_update_val = row_vals[crm_update_idx - 1] if crm_update_idx - 1 < len(row_vals) else ""
+        if crm_update_val and "DUPLICATE" in str(crm_update_val).upper():
+            return True
+    return False
+
 
 # =========================
 # CENTRAL FIELD MAPPING
@@ -257,8 +332,8 @@ STATIC_CRM_FIELDS = {
 ws_ex = client.open(SHEET_NAME).worksheet(EXHIBITOR_TAB)
 ws_sp = client.open(SHEET_NAME).worksheet(SPEAKER_TAB)
 
-ex_vals = ws_ex.get_all_values()
-sp_vals = ws_sp.get_all_values()
+ex_vals = fetch_values(ws_ex)
+sp_vals = fetch_values(ws_sp)
 
 ex_header = ex_vals[0]
 sp_header = sp_vals[0]
@@ -272,8 +347,8 @@ ex_update_col = ensure_col(ws_ex, ex_hmap, ex_header, CRM_UPDATE_COL)
 sp_update_col = ensure_col(ws_sp, sp_hmap, sp_header, CRM_UPDATE_COL)
 
 # re-fetch after ensure_col to pick up new headers if any
-ex_vals = ws_ex.get_all_values()
-sp_vals = ws_sp.get_all_values()
+ex_vals = fetch_values(ws_ex)
+sp_vals = fetch_values(ws_sp)
 ex_header = ex_vals[0]
 sp_header = sp_vals[0]
 ex_hmap = header_to_index(ex_header)
@@ -333,13 +408,14 @@ def build_payload_from_row(row_dict, opp_type, multi, is_exhibitor):
 
 
 # =========================
-# FLOW 1 – CREATE LEADS
+# FLOW HELPERS
 # =========================
-def flow1_create_and_sync_duplicates():
-    updates = defaultdict(list)
+def collect_email_rows(ex_vals, sp_vals):
+    """Group exhibitor and speaker rows by lowercased email."""
     emap = {}
 
     # EXHIBITOR
+    ex_header = ex_vals[0]
     for i, row in enumerate(ex_vals[1:], start=2):
         d = row_to_dict(ex_header, row)
         email = (d.get("Email") or "").strip().lower()
@@ -350,6 +426,7 @@ def flow1_create_and_sync_duplicates():
         emap[email]["ex"] = {"row": i, "data": d, "crm": ex_crm_id.strip()}
 
     # SPEAKER
+    sp_header = sp_vals[0]
     for i, row in enumerate(sp_vals[1:], start=2):
         d = row_to_dict(sp_header, row)
         email = (d.get("Email") or "").strip().lower()
@@ -359,91 +436,112 @@ def flow1_create_and_sync_duplicates():
         emap.setdefault(email, {"ex": None, "sp": None})
         emap[email]["sp"] = {"row": i, "data": d, "crm": sp_crm_id.strip()}
 
+    return emap
+
+def resolve_primary(ex, sp):
+    """Pick the primary row for an email: returns (primary, primary_id, primary_is_ex, secondary)."""
+    ex_id = (ex["crm"] or "").strip() if ex else ""
+    sp_id = (sp["crm"] or "").strip() if sp else ""
+
+    # Case: exists in both sheets
+    if ex and sp:
+        # If either side already has CRM id, that side is primary
+        if ex_id:
+            return ex, ex_id, True, sp
+        if sp_id:
+            return sp, sp_id, False, ex
+        # Neither has CRM id → exhibitor is primary
+        return ex, "", True, sp
+
+    # Only exhibitor
+    if ex:
+        return ex, ex_id, True, None
+
+    # Only speaker
+    return sp, sp_id, False, None
+
+def collect_crm_rows(ex_vals, sp_vals):
+    """List (sheet_type, crm_id, email, row_num) for every row holding a CRM id."""
+    crm_rows = []
+    ex_hmap = header_to_index(ex_vals[0])
+    sp_hmap = header_to_index(sp_vals[0])
+
+    for i, row in enumerate(ex_vals[1:], start=2):
+        crm_id = (row[ex_crm_col - 1] if ex_crm_col - 1 < len(row) else "").strip()
+        if crm_id:
+            email = row[ex_hmap["Email"] - 1].lower()
+            crm_rows.append(("ex", crm_id.strip(), email, i))
+
+    for i, row in enumerate(sp_vals[1:], start=2):
+        crm_id = (row[sp_crm_col - 1] if sp_crm_col - 1 < len(row) else "").strip()
+        if crm_id:
+            email = row[sp_hmap["Email"] - 1].lower()
+            crm_rows.append(("sp", crm_id.strip(), email, i))
+
+    return crm_rows
+
+
+def build_flow1_payload(primary, primary_is_ex, ex, sp):
+    return build_payload_from_row(
+        primary["data"],
+        "Exhibitor/Speaker" if (ex and sp) else (
+            "Exhibitor_opportunity" if ex else "speaker_opportunity"
+        ),
+        "Exhibitor,Speaker" if (ex and sp) else ("Exhibitor" if ex else "Speaker"),
+        True if primary_is_ex else False
+    )
+
+# Cells flow 1 writes per outcome, in write order: (column, value)
+FLOW1_OUTCOME_CELLS = {
+    "copied": [("crm", None), ("update", "DUPLICATE – CRM ID COPIED")],
+    "added": [("crm", None), ("update", "ADDED IN CRM")],
+    "duplicate": [("update", "Failed to add in CRM – Duplicate detected"), ("crm", "DUPLICATE")],
+}
+
+def flow1_cell_writes(outcome, primary_is_ex, primary, secondary, crm_id=""):
+    """List ("ex"|"sp", A1 range, value) cells flow 1 writes for an outcome.
+
+    "copied" only touches a secondary row that has no CRM id yet; "added" and
+    "duplicate" touch the primary row and the secondary row if any. A None
+    value in FLOW1_OUTCOME_CELLS is filled with `crm_id`.
+    """
+    p_type, s_type = ("ex", "sp") if primary_is_ex else ("sp", "ex")
+    targets = []
+    if outcome != "copied":
+        targets.append((p_type, primary["row"]))
+    if secondary and (outcome != "copied" or not (secondary.get("crm") or "").strip()):
+        targets.append((s_type, secondary["row"]))
+
+    writes = []
+    for sheet_type, row in targets:
+        for kind, value in FLOW1_OUTCOME_CELLS[outcome]:
+            if kind == "crm":
+                col = ex_crm_col if sheet_type == "ex" else sp_crm_col
+            else:
+                col = ex_update_col if sheet_type == "ex" else sp_update_col
+            writes.append((sheet_type, f"{col_to_a1(col)}{row}", crm_id if value is None else value))
+    return writes
+
+
+# =========================
+# FLOW 1 – CREATE LEADS
+# =========================
+def flow1_create_and_sync_duplicates():
+    updates = defaultdict(list)
+    emap = collect_email_rows(ex_vals, sp_vals)
+
     # PROCESS
     for email, block in emap.items():
         ex = block.get("ex")
         sp = block.get("sp")
 
-        ex_id = ex["crm"] if ex else ""
-        sp_id = sp["crm"] if sp else ""
-
-        # Normalize
-        ex_id = ex_id.strip() if ex_id else ""
-        sp_id = sp_id.strip() if sp_id else ""
-
-        # Determine primary / secondary
-        primary = None
-        secondary = None
-        primary_ws = None
-        secondary_ws = None
-        primary_row = None
-        secondary_row = None
-        primary_is_ex = False
-
-        # Case: exists in both sheets
-        if ex and sp:
-            # If either side already has CRM id, that side is primary
-            if ex_id:
-                primary = ex
-                primary_id = ex_id
-                primary_ws = ws_ex
-                primary_row = ex["row"]
-                secondary = sp
-                secondary_ws = ws_sp
-                secondary_row = sp["row"]
-                primary_is_ex = True
-            elif sp_id:
-                primary = sp
-                primary_id = sp_id
-                primary_ws = ws_sp
-                primary_row = sp["row"]
-                secondary = ex
-                secondary_ws = ws_ex
-                secondary_row = ex["row"]
-                primary_is_ex = False
-            else:
-                # Neither has CRM id → exhibitor is primary
-                primary = ex
-                primary_id = ""
-                primary_ws = ws_ex
-                primary_row = ex["row"]
-                secondary = sp
-                secondary_ws = ws_sp
-                secondary_row = sp["row"]
-                primary_is_ex = True
-
-        # Only exhibitor
-        elif ex:
-            primary = ex
-            primary_id = ex_id
-            primary_ws = ws_ex
-            primary_row = ex["row"]
-            secondary = None
-            primary_is_ex = True
-
-        # Only speaker
-        else:
-            primary = sp
-            primary_id = sp_id
-            primary_ws = ws_sp
-            primary_row = sp["row"]
-            secondary = None
-            primary_is_ex = False
+        primary, primary_id, primary_is_ex, secondary = resolve_primary(ex, sp)
 
         # If primary already has CRM id
         if primary_id:
             # Copy to secondary if it exists and doesn't have an id
-            if secondary:
-                sec_id = secondary["crm"].strip() if secondary.get("crm") else ""
-                if not sec_id:
-                    updates[secondary_ws].append({
-                        "range": f"{col_to_a1(sp_crm_col if secondary_ws==ws_sp else ex_crm_col)}{secondary_row}",
-                        "values": [[primary_id]]
-                    })
-                    updates[secondary_ws].append({
-                        "range": f"{col_to_a1(sp_update_col if secondary_ws==ws_sp else ex_update_col)}{secondary_row}",
-                        "values": [["DUPLICATE – CRM ID COPIED"]]
-                    })
+            for ws, rng, value in flow1_cell_writes("copied", primary_is_ex, primary, secondary, primary_id):
+                updates[ws_ex if ws == "ex" else ws_sp].append({"range": rng, "values": [[value]]})
             # Nothing more to do for this email
             continue
 
@@ -451,39 +549,15 @@ def flow1_create_and_sync_duplicates():
         try:
             print(f"➕ Creating CRM lead for {email}",flush=True)
 
-            pdata = build_payload_from_row(
-                primary["data"],
-                "Exhibitor/Speaker" if (ex and sp) else (
-                    "Exhibitor_opportunity" if ex else "speaker_opportunity"
-                ),
-                "Exhibitor,Speaker" if (ex and sp) else ("Exhibitor" if ex else "Speaker"),
-                True if primary_is_ex else False
-            )
+            pdata = build_flow1_payload(primary, primary_is_ex, ex, sp)
 
             res = crm.create_lead(pdata)
             new_id = res["id"]
             print(f"✅ Created lead {new_id}",flush=True)
 
-            # Update primary row -> ADDED IN CRM
-            updates[primary_ws].append({
-                "range": f"{col_to_a1(ex_crm_col if primary_ws==ws_ex else sp_crm_col)}{primary_row}",
-                "values": [[new_id]]
-            })
-            updates[primary_ws].append({
-                "range": f"{col_to_a1(ex_update_col if primary_ws==ws_ex else sp_update_col)}{primary_row}",
-                "values": [["ADDED IN CRM"]]
-            })
-
-            # If secondary exists -> copy ID and mark ADDED IN CRM
-            if secondary:
-                updates[secondary_ws].append({
-                    "range": f"{col_to_a1(sp_crm_col if secondary_ws==ws_sp else ex_crm_col)}{secondary_row}",
-                    "values": [[new_id]]
-                })
-                updates[secondary_ws].append({
-                    "range": f"{col_to_a1(sp_update_col if secondary_ws==ws_sp else ex_update_col)}{secondary_row}",
-                    "values": [["ADDED IN CRM"]]
-                })
+            # Primary (and secondary) rows -> new ID + ADDED IN CRM
+            for ws, rng, value in flow1_cell_writes("added", primary_is_ex, primary, secondary, new_id):
+                updates[ws_ex if ws == "ex" else ws_sp].append({"range": rng, "values": [[value]]})
 
         except Exception as e:
             err = str(e)
@@ -492,28 +566,9 @@ def flow1_create_and_sync_duplicates():
             if "Duplicate(s) detected" in err or "duplicate" in err.lower():
                 print(f"⚠️ Duplicate detected in CRM for {email}, marking in sheet...", flush=True)
 
-                # Mark PRIMARY row
-                updates[primary_ws].append({
-                    "range": f"{col_to_a1(ex_update_col if primary_ws == ws_ex else sp_update_col)}{primary_row}",
-                    "values": [["Failed to add in CRM – Duplicate detected"]]
-                })
-
-                # Write BLOCKER CRM ID so script skips next time
-                updates[primary_ws].append({
-                    "range": f"{col_to_a1(ex_crm_col if primary_ws == ws_ex else sp_crm_col)}{primary_row}",
-                    "values": [["DUPLICATE"]]
-                })
-
-                # If secondary exists → mark that too
-                if secondary:
-                    updates[secondary_ws].append({
-                        "range": f"{col_to_a1(sp_update_col if secondary_ws == ws_sp else ex_update_col)}{secondary_row}",
-                        "values": [["Failed to add in CRM – Duplicate detected"]]
-                    })
-                    updates[secondary_ws].append({
-                        "range": f"{col_to_a1(sp_crm_col if secondary_ws == ws_sp else ex_crm_col)}{secondary_row}",
-                        "values": [["DUPLICATE"]]
-                    })
+                # Mark rows and write BLOCKER CRM ID so script skips next time
+                for ws, rng, value in flow1_cell_writes("duplicate", primary_is_ex, primary, secondary):
+                    updates[ws_ex if ws == "ex" else ws_sp].append({"range": rng, "values": [[value]]})
 
                 continue  # Skip this lead completely
 
@@ -522,9 +577,7 @@ def flow1_create_and_sync_duplicates():
 
 
     # APPLY UPDATES
-    for ws, batch in updates.items():
-        if batch:
-            ws.batch_update(batch)
+    apply_sheet_updates(updates)
 
     print("🌱 FLOW 1 COMPLETE",flush=True)
 
@@ -534,20 +587,9 @@ def flow1_create_and_sync_duplicates():
 # =========================
 def flow2_sync_crm_to_sheet():
     updates = defaultdict(list)
-    crm_rows = []
 
     # Build CRM row list
-    for i, row in enumerate(ex_vals[1:], start=2):
-        crm_id = (row[ex_crm_col - 1] if ex_crm_col - 1 < len(row) else "").strip()
-        if crm_id:
-            email = row[ex_hmap["Email"] - 1].lower()
-            crm_rows.append(("ex", crm_id.strip(), email, i))
-
-    for i, row in enumerate(sp_vals[1:], start=2):
-        crm_id = (row[sp_crm_col - 1] if sp_crm_col - 1 < len(row) else "").strip()
-        if crm_id:
-            email = row[sp_hmap["Email"] - 1].lower()
-            crm_rows.append(("sp", crm_id.strip(), email, i))
+    crm_rows = collect_crm_rows(ex_vals, sp_vals)
 
     for sheet_type, crm_id, email, row_num in crm_rows:
         try:
@@ -558,11 +600,8 @@ def flow2_sync_crm_to_sheet():
             row_data = row_to_dict(ex_header if sheet_type == "ex" else sp_header, row_vals)
 
             # Skip syncing for duplicate-marked rows
-            crm_update_idx = hmap.get(CRM_UPDATE_COL)
-            if crm_update_idx:
-                crm_update_val = row_vals[crm_update_idx - 1] if crm_update_idx - 1 < len(row_vals) else ""
-                if crm_update_val and "DUPLICATE" in str(crm_update_val).upper():
-                    continue
+            if is_duplicate_marked(row_vals, hmap):
+                continue
 
             # Try retrieving CRM record
             crm_data = crm.get_lead(crm_id)
@@ -578,17 +617,12 @@ def flow2_sync_crm_to_sheet():
 
             # Sheet newer → update CRM
             if sdt and (cdt is None or cdt < sdt):
-                session = crm.get_session()
                 full = crm_data.copy()
                 full["id"] = crm_id
                 full["cf_1153"] = to_crm_date(sdt)
                 for k in ["createdtime", "modifiedtime"]:
                     full.pop(k, None)
-                requests.post(crm.base_url, data={
-                    "operation": "update",
-                    "sessionName": session,
-                    "element": json.dumps(full)
-                })
+                crm.update_lead(full)
 
             # CRM newer → update sheet
             elif cdt and (sdt is None or cdt > sdt):
@@ -642,27 +676,286 @@ def flow2_sync_crm_to_sheet():
                 print(f"⚠️ Unknown CRM error for {email}, skipping...")
 
     # Apply updates
-    for ws, batch in updates.items():
-        if batch:
-            ws.batch_update(batch)
+    apply_sheet_updates(updates)
 
     print("📝 FLOW 2 COMPLETE", flush=True)
 
+
+# =========================
+# DRY-RUN PLANNER
+# =========================
+# Fallback per-call cost (seconds, bytes out, bytes in) until real runs have
+# recorded latencies in LATENCY_FILE. None = size is known from the plan.
+DEFAULT_CALL_COST = {
+    "login": (0.5, 150, 300),
+    "create": (1.0, None, 1500),
+    "retrieve": (0.6, None, 3000),
+    "query": (0.6, None, 1500),
+    "update": (1.0, 4000, 3000),
+    "sheets_read": (1.0, 0, None),
+    "sheets_write": (1.0, None, 500),
+}
+
+def load_latency_stats():
+    try:
+        with open(LATENCY_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_latency_stats():
+    """Merge this run's CALL_STATS into LATENCY_FILE."""
+    stats = load_latency_stats()
+    for op, st in CALL_STATS.items():
+        acc = stats.setdefault(op, {"calls": 0, "seconds": 0.0, "bytes_out": 0, "bytes_in": 0})
+        for k in acc:
+            acc[k] += st[k]
+    with open(LATENCY_FILE, "w") as f:
+        json.dump(stats, f, indent=2, sort_keys=True)
+
+def planned_write(tab, col, row, value, when="always"):
+    return {"tab": tab, "range": f"{col_to_a1(col)}{row}", "value": value, "when": when}
+
+def apply_planned_writes(vals, writes):
+    """Return a copy of a tab's values with planned cell writes applied."""
+    vals = [list(r) for r in vals]
+    for w in writes:
+        letters = w["range"].rstrip("0123456789")
+        row, col = int(w["range"][len(letters):]), a1_to_col(letters)
+        while len(vals) < row:
+            vals.append([])
+        cells = vals[row - 1]
+        cells.extend([""] * (col - len(cells)))
+        cells[col - 1] = w["value"]
+    return vals
+
+def plan_flow1(ex_vals, sp_vals):
+    """Mirror flow1_create_and_sync_duplicates: returns (crm_ops, sheet_writes)."""
+    crm_ops, writes = [], []
+    emap = collect_email_rows(ex_vals, sp_vals)
+
+    for email, block in emap.items():
+        ex = block.get("ex")
+        sp = block.get("sp")
+
+        primary, primary_id, primary_is_ex, secondary = resolve_primary(ex, sp)
+
+        if primary_id:
+            cells = flow1_cell_writes("copied", primary_is_ex, primary, secondary, primary_id)
+        else:
+            pdata = build_flow1_payload(primary, primary_is_ex, ex, sp)
+            body = urlencode({"operation": "create", "sessionName": "", "elementType": "Leads",
+                              "element": json.dumps(pdata)})
+            crm_ops.append({"op": "create", "tab": EXHIBITOR_TAB if primary_is_ex else SPEAKER_TAB,
+                            "row": primary["row"], "email": email, "payload": pdata, "when": "always",
+                            "bytes_out": len(crm.base_url) + len(body)})
+            # A CRM duplicate error writes the same cells with "DUPLICATE" markers
+            cells = flow1_cell_writes("added", primary_is_ex, primary, secondary, f"<new:{email}>")
+
+        for sheet_type, rng, value in cells:
+            writes.append({"tab": EXHIBITOR_TAB if sheet_type == "ex" else SPEAKER_TAB,
+                           "range": rng, "value": value, "when": "always"})
+
+    return crm_ops, writes
+
+def plan_flow2(ex_vals, sp_vals):
+    """Mirror flow2_sync_crm_to_sheet: returns (crm_ops, sheet_writes).
+
+    Whether the CRM update, the date write, the comments write or the
+    invalid-id cleanup happens depends on the CRM's answer, so those are
+    planned with a "when" condition instead of "always".
+    """
+    crm_ops, writes = [], []
+    hmaps = {"ex": header_to_index(ex_vals[0]), "sp": header_to_index(sp_vals[0])}
+
+    for sheet_type, crm_id, email, row_num in collect_crm_rows(ex_vals, sp_vals):
+        tab = EXHIBITOR_TAB if sheet_type == "ex" else SPEAKER_TAB
+        vals = ex_vals if sheet_type == "ex" else sp_vals
+        hmap = hmaps[sheet_type]
+        row_vals = vals[row_num - 1]
+        row_data = row_to_dict(vals[0], row_vals)
+
+        if is_duplicate_marked(row_vals, hmap):
+            continue
+
+        base = {"tab": tab, "row": row_num, "email": email, "crm_id": crm_id}
+        params = {"operation": "retrieve", "sessionName": "", "id": crm_id}
+        crm_ops.append(dict(base, op="retrieve", when="always",
+                            bytes_out=len(crm.base_url) + len(urlencode(params))))
+        query = (
+            f"select commentcontent,createdtime from ModComments "
+            f"where related_to='{crm_id}' ORDER BY createdtime ASC;"
+        )
+        params = {"operation": "query", "sessionName": "", "query": query}
+        crm_ops.append(dict(base, op="query", when="always",
+                            bytes_out=len(crm.base_url) + len(urlencode(params))))
+
+        sheet_date_col = "Last Follow-Up Date" if sheet_type == "ex" else "Email Sent-Date"
+        if parse_sheet_date(row_data.get(sheet_date_col, "")):
+            crm_ops.append(dict(base, op="update", when="sheet date newer than CRM cf_1153"))
+        if sheet_date_col in hmap:
+            writes.append(planned_write(tab, hmap[sheet_date_col], row_num, "<crm:cf_1153>",
+                                        "CRM cf_1153 newer than sheet"))
+        if "Comments" in hmap:
+            writes.append(planned_write(tab, hmap["Comments"], row_num, "<crm:comments>",
+                                        "lead has comments"))
+
+        # CRM rejects the id → clear CRM Lead ID and CRM Update for Flow 1 to recreate
+        crm_id_col = ex_crm_col if sheet_type == "ex" else sp_crm_col
+        crm_update_col = ex_update_col if sheet_type == "ex" else sp_update_col
+        writes.append(planned_write(tab, crm_id_col, row_num, "", "CRM rejects id"))
+        writes.append(planned_write(tab, crm_update_col, row_num, "", "CRM rejects id"))
+
+    return crm_ops, writes
+
+def avg_call_cost(stats, op, idx, key):
+    """Recorded per-call average for `key`, else DEFAULT_CALL_COST[op][idx]."""
+    rec = stats.get(op) or {}
+    if rec.get("calls"):
+        return rec[key] / rec["calls"]
+    return DEFAULT_CALL_COST[op][idx] or 0
+
+def planned_cell_bytes(value, stats):
+    """JSON size of a planned cell value; CRM placeholders are sized from averages."""
+    if value == "<crm:comments>":
+        # The cell gets the lead's whole comment history, i.e. the query response
+        return int(avg_call_cost(stats, "query", 2, "bytes_in"))
+    if value == "<crm:cf_1153>":
+        return len(json.dumps("YYYY-MM-DD"))
+    return len(json.dumps(value))
+
+def estimate_cost(calls, stats):
+    """Aggregate planned calls into counts, bytes and seconds per operation.
+
+    `calls` holds {"op", "always", "bytes_out", "bytes_in"}; unknown sizes
+    fall back to recorded averages, then DEFAULT_CALL_COST. Bytes and seconds
+    are upper bounds (every conditional call made); est_seconds_min counts
+    only unconditional calls.
+    """
+    def avg(op, idx, key):
+        return avg_call_cost(stats, op, idx, key)
+
+    summary = {}
+    for c in calls:
+        op = c["op"]
+        s = summary.setdefault(op, {"calls": 0, "max_calls": 0, "est_bytes": 0,
+                                    "est_seconds": 0.0, "est_seconds_min": 0.0})
+        sec = avg(op, 0, "seconds")
+        out = c.get("bytes_out")
+        inn = c.get("bytes_in")
+        s["max_calls"] += 1
+        s["est_seconds"] += sec
+        s["est_bytes"] += int((out if out is not None else avg(op, 1, "bytes_out"))
+                              + (inn if inn is not None else avg(op, 2, "bytes_in")))
+        if c["always"]:
+            s["calls"] += 1
+            s["est_seconds_min"] += sec
+
+    total = {"calls": 0, "max_calls": 0, "est_bytes": 0, "est_seconds": 0.0, "est_seconds_min": 0.0}
+    for s in summary.values():
+        s["est_seconds"] = round(s["est_seconds"], 2)
+        s["est_seconds_min"] = round(s["est_seconds_min"], 2)
+        for k in total:
+            total[k] += s[k]
+    total["est_seconds"] = round(total["est_seconds"], 2)
+    total["est_seconds_min"] = round(total["est_seconds_min"], 2)
+    summary["total"] = total
+    return summary
+
+def build_dry_run_plan():
+    """Plan flows 1 and 2 against the loaded sheets without any writes."""
+    vals = {EXHIBITOR_TAB: ex_vals, SPEAKER_TAB: sp_vals}
+    # Startup reads each tab once before and once after ensure_col
+    startup_reads = [
+        {"op": "sheets_read", "always": True, "bytes_in": len(json.dumps(v))} for v in vals.values()
+    ]
+    for tab in vals:
+        vals[tab] = apply_planned_writes(vals[tab], [h for h in PLANNED_HEADERS if h["tab"] == tab])
+    startup_reads += [
+        {"op": "sheets_read", "always": True, "bytes_in": len(json.dumps(v))} for v in vals.values()
+    ]
+
+    f1_crm, f1_writes = plan_flow1(vals[EXHIBITOR_TAB], vals[SPEAKER_TAB])
+
+    # Flow 2 runs on the refreshed sheets, i.e. after flow 1's writes land
+    for tab in vals:
+        vals[tab] = apply_planned_writes(vals[tab], [w for w in f1_writes if w["tab"] == tab])
+    f2_crm, f2_writes = plan_flow2(vals[EXHIBITOR_TAB], vals[SPEAKER_TAB])
+
+    stats = load_latency_stats()
+    calls = list(startup_reads)
+    for op in f1_crm + f2_crm:
+        calls.append({"op": op["op"], "always": op["when"] == "always", "bytes_out": op.get("bytes_out")})
+    for h in PLANNED_HEADERS:
+        calls.append({"op": "sheets_write", "always": True, "bytes_out": len(json.dumps([[h["value"]]]))})
+    for writes in (f1_writes, f2_writes):
+        for tab in vals:
+            batch = [w for w in writes if w["tab"] == tab]
+            if batch:
+                # Size the batch envelope with empty cells, then add each cell's own size
+                body = [{"range": w["range"], "values": [[""]]} for w in batch]
+                size = len(json.dumps(body)) + sum(planned_cell_bytes(w["value"], stats) - 2 for w in batch)
+                calls.append({"op": "sheets_write", "always": any(w["when"] == "always" for w in batch),
+                              "bytes_out": size})
+    # Sheets are re-read between the two flows
+    for tab in vals:
+        calls.append({"op": "sheets_read", "always": True, "bytes_in": len(json.dumps(vals[tab]))})
+
+    if f1_crm or f2_crm:
+        # getchallenge + login at start and again each time the session expires
+        est = estimate_cost(calls, stats)["total"]
+        min_logins = 1 + int(est["est_seconds_min"] // SESSION_TTL)
+        max_logins = 1 + int(est["est_seconds"] // SESSION_TTL)
+        calls += [{"op": "login", "always": True}] * (2 * min_logins)
+        calls += [{"op": "login", "always": False}] * (2 * (max_logins - min_logins))
+    summary = estimate_cost(calls, stats)
+    if "login" in summary:
+        summary["login"]["note"] = f"2 calls per login, one login per {SESSION_TTL}s of estimated run time"
+
+    return {
+        "setup": {"sheet": PLANNED_HEADERS},
+        "flow1": {"crm": f1_crm, "sheet": f1_writes},
+        "flow2": {"crm": f2_crm, "sheet": f2_writes},
+        "summary": summary,
+    }
+
+def run_dry_run():
+    plan = build_dry_run_plan()
+    with open(PLAN_FILE, "w") as f:
+        json.dump(plan, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+    print(f"🧪 DRY RUN – plan written to {PLAN_FILE}", flush=True)
+    for op, s in plan["summary"].items():
+        print(
+            f"   {op:<13} calls={s['calls']} (max {s['max_calls']}) "
+            f"bytes≈{s['est_bytes']} time≈{s['est_seconds_min']}–{s['est_seconds']}s",
+            flush=True
+        )
+
+
 # =========================
 # RUN SCRIPT
 # =========================
 if __name__ == "__main__":
+    if DRY_RUN:
+        run_dry_run()
+        sys.exit(0)
+
     print("🚀 Starting SYNC...",flush=True)
-    flow1_create_and_sync_duplicates()
-    # REFRESH SHEET DATA BEFORE FLOW 2
-    ex_vals = ws_ex.get_all_values()
-    sp_vals = ws_sp.get_all_values()
+    try:
+        flow1_create_and_sync_duplicates()
+        # REFRESH SHEET DATA BEFORE FLOW 2
+        ex_vals = fetch_values(ws_ex)
+        sp_vals = fetch_values(ws_sp)
 
-    ex_header = ex_vals[0]
-    sp_header = sp_vals[0]
-    
-    ex_hmap = header_to_index(ex_header)
-    sp_hmap = header_to_index(sp_header)
-    
-    flow2_sync_crm_to_sheet()
+        ex_header = ex_vals[0]
+        sp_header = sp_vals[0]
+
+        ex_hmap = header_to_index(ex_header)
+        sp_hmap = header_to_index(sp_header)
+
+        flow2_sync_crm_to_sheet()
+    finally:
+        # Keep measured latencies even if a flow crashes part-way
+        save_latency_stats()
     print("✅ SYNC COMPLETE.",flush=True)